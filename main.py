@@ -1,35 +1,87 @@
 import asyncio
 import aiohttp
+import numpy as np
 import time
 import argparse
-import statistics
+import math
+import multiprocessing
+import os
+import random
 from dataclasses import dataclass
-from typing import List, Dict
 import logging
-from concurrent.futures import ThreadPoolExecutor
+import socket
 import struct
 
-@dataclass
+# Per-client reservoir size for latency percentiles; memory stays O(1)
+# per client no matter how long the test runs
+RESERVOIR_SIZE = 4096
+
+# Metric updates are folded in per batch of chunks rather than per chunk,
+# whichever of these limits is hit first
+BATCH_CHUNKS = 64
+BATCH_INTERVAL_NS = 50_000_000
+
+# FLV header: 'FLV' signature, version, type flags, header size
+_FLV_HEADER = struct.Struct('>3sBBI')
+
+# Kernel receive buffer per connection; a large SO_RCVBUF lets data pile
+# up between reads so iter_any() drains bigger batches with fewer recv
+# syscalls (throughput matters here, not per-chunk latency)
+RECV_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Scratch buffer size for drain mode reads. On Linux, MSG_TRUNC on a TCP
+# socket tells the kernel to drop the payload without copying it out, so
+# the buffer contents are never even written
+RAW_DRAIN_BUFSIZE = 65536
+_MSG_TRUNC = getattr(socket, 'MSG_TRUNC', 0)
+
+# Shared by every client request; aiohttp copies the mapping internally
+_HEADERS = {
+    'User-Agent': 'FLVLoadTester/1.0',
+    'Connection': 'keep-alive',
+    'Accept': '*/*'
+}
+
+
+def _make_stream_socket(addr_info):
+    """Socket factory for the TCPConnector with a tuned receive buffer."""
+    family, type_, proto, *_ = addr_info
+    sock = socket.socket(family=family, type=type_, proto=proto)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECV_BUFFER_SIZE)
+    return sock
+
+@dataclass(slots=True)
 class StreamMetrics:
     total_bytes: int = 0
     packet_count: int = 0
-    start_time: float = 0
-    last_packet_time: float = 0
-    bitrates: List[float] = None
-    latencies: List[float] = None
+    start_time_ns: int = 0
+    last_packet_time_ns: int = 0
+    # Running latency aggregates (ns): mean/stddev/max come from these,
+    # percentiles from a fixed-size reservoir sample
+    latency_count: int = 0
+    sum_latency_ns: float = 0.0
+    sum_latency_sq_ns: float = 0.0
+    max_latency_ns: float = 0.0
+    latency_reservoir: np.ndarray = None
 
     def __post_init__(self):
-        self.bitrates = []
-        self.latencies = []
+        self.latency_reservoir = np.empty(RESERVOIR_SIZE, dtype=np.float32)
 
 class FLVLoadTester:
-    def __init__(self, url: str, num_clients: int, duration: int):
+    def __init__(self, url: str, num_clients: int, duration: int, max_concurrency: int = 200,
+                 verbose: bool = False, mode: str = 'full'):
         self.url = url
         self.num_clients = num_clients
         self.duration = duration
-        self.client_metrics: Dict[int, StreamMetrics] = {}
-        self.running = True
-        
+        self.max_concurrency = max_concurrency
+        self.verbose = verbose
+        self.mode = mode
+        # Dense integer client ids, so a list index beats a dict lookup
+        # on every metrics update
+        self.client_metrics: list[StreamMetrics] = [StreamMetrics() for _ in range(num_clients)]
+        self.session: aiohttp.ClientSession = None
+        self.sem = asyncio.Semaphore(max_concurrency)
+
         # Setup logging
         logging.basicConfig(
             level=logging.DEBUG,  # Changed to DEBUG level for more detailed logs
@@ -40,171 +92,436 @@ class FLVLoadTester:
     async def parse_flv_header(self, data: bytes) -> bool:
         """Parse FLV header to verify the stream."""
         try:
-            self.logger.debug(f"Received header data (hex): {data.hex()}")
-            if len(data) < 9:
+            # data.hex() doubles the allocation, so only build it when
+            # DEBUG is actually enabled
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Received header data (hex): %s", data.hex())
+            if len(data) < _FLV_HEADER.size:
                 self.logger.error(f"Header too short: {len(data)} bytes")
                 return False
-            
-            # Check FLV signature
-            if data[:3] != b'FLV':
-                self.logger.error(f"Invalid FLV signature: {data[:3]}")
+
+            # unpack_from on a memoryview reads the fields in place,
+            # without slicing out intermediate bytes objects
+            signature, version, flags, header_size = _FLV_HEADER.unpack_from(memoryview(data), 0)
+
+            if signature != b'FLV':
+                self.logger.error(f"Invalid FLV signature: {signature}")
                 return False
-                
-            version = data[3]
-            flags = data[4]
-            header_size = struct.unpack('>I', data[5:9])[0]
-            
-            self.logger.info(f"FLV Header: version={version}, flags={flags}, header_size={header_size}")
+
+            self.logger.info("FLV Header: version=%s, flags=%s, header_size=%s", version, flags, header_size)
             return True
         except Exception as e:
             self.logger.error(f"Error parsing FLV header: {e}")
             return False
 
-    async def process_flv_packets(self, data: bytes, client_id: int):
-        """Process FLV packets and update metrics."""
+    async def process_flv_packets(self, n_bytes: int, n_chunks: int, client_id: int):
+        """Fold a batch of received chunks into the client's metrics."""
         metrics = self.client_metrics[client_id]
-        current_time = time.time()
-        
+        now_ns = time.monotonic_ns()
+
         # Update metrics
-        metrics.total_bytes += len(data)
-        metrics.packet_count += 1
-        
-        # Calculate latency
-        if metrics.last_packet_time > 0:
-            latency = current_time - metrics.last_packet_time
-            metrics.latencies.append(latency)
-        
-        # Calculate bitrate (bits per second)
-        if metrics.last_packet_time > 0:
-            time_diff = current_time - metrics.last_packet_time
-            if time_diff > 0:
-                bitrate = (len(data) * 8) / time_diff
-                metrics.bitrates.append(bitrate)
-        
-        metrics.last_packet_time = current_time
-        
+        metrics.total_bytes += n_bytes
+        metrics.packet_count += n_chunks
+
+        last_ns = metrics.last_packet_time_ns
+        if last_ns > 0:
+            delta_ns = now_ns - last_ns
+
+            # Fold mean inter-chunk latency over the batch (ns) into the
+            # running aggregates instead of retaining every sample
+            lat_ns = delta_ns / n_chunks
+            metrics.sum_latency_ns += lat_ns
+            metrics.sum_latency_sq_ns += lat_ns * lat_ns
+            if lat_ns > metrics.max_latency_ns:
+                metrics.max_latency_ns = lat_ns
+
+            # Reservoir sampling keeps an unbiased subset for percentiles
+            i = metrics.latency_count
+            metrics.latency_count = i + 1
+            if i < RESERVOIR_SIZE:
+                metrics.latency_reservoir[i] = lat_ns
+            else:
+                j = random.randrange(i + 1)
+                if j < RESERVOIR_SIZE:
+                    metrics.latency_reservoir[j] = lat_ns
+
+        metrics.last_packet_time_ns = now_ns
+
         # Log packet details periodically
-        if metrics.packet_count % 100 == 0:
-            self.logger.debug(f"Client {client_id}: Received packet {metrics.packet_count}, "
-                            f"size={len(data)} bytes, total={metrics.total_bytes} bytes")
+        if metrics.packet_count % 1000 < n_chunks:
+            self.logger.debug("Client %s: Received %s chunks, total=%s bytes",
+                            client_id, metrics.packet_count, metrics.total_bytes)
+
+    async def _drain_raw_socket(self, response, client_id: int):
+        """Count the stream straight off the kernel socket.
+
+        Drops below aiohttp's payload parser: the transport is paused,
+        we take over readability of the raw socket and recv_into a single
+        preallocated buffer with MSG_TRUNC, so no bytes object is built
+        per chunk and on Linux the kernel discards the payload without
+        copying it to userspace at all. Chunked/gzip decoding is bypassed,
+        so byte totals include transfer framing -- fine for a stress tool.
+        The connection cannot be reused afterwards and is closed.
+        """
+        metrics = self.client_metrics[client_id]
+        loop = asyncio.get_running_loop()
+        transport = response.connection.transport
+        sock = transport.get_extra_info('socket')
+        if sock is None:
+            self.logger.error(f"Client {client_id}: No raw socket (TLS?), cannot drain")
+            return
+
+        # Anything aiohttp already buffered past the headers still counts
+        pre = response.content.read_nowait(-1)
+        n_bytes = len(pre)
+        n_chunks = 1 if pre else 0
+        if pre and not await self.parse_flv_header(pre[:9]):
+            self.logger.error(f"Client {client_id}: Not a valid FLV stream")
+            return
+
+        buf = bytearray(RAW_DRAIN_BUFSIZE)
+        done = loop.create_future()
+        counts = [n_bytes, n_chunks]
+
+        # The loop refuses add_reader on an fd owned by a transport, so
+        # drain through a dup'ed fd (same underlying socket) while the
+        # transport itself is paused
+        drain_sock = sock.dup()
+        drain_sock.setblocking(False)
+        fd = drain_sock.fileno()
+
+        def on_readable():
+            try:
+                while True:
+                    n = drain_sock.recv_into(buf, RAW_DRAIN_BUFSIZE, _MSG_TRUNC)
+                    if n == 0:
+                        if not done.done():
+                            done.set_result(True)
+                        return
+                    counts[0] += n
+                    counts[1] += 1
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                if not done.done():
+                    done.set_exception(e)
+
+        transport.pause_reading()
+        loop.add_reader(fd, on_readable)
+        try:
+            # Resolves on EOF or socket error; cancelled by the duration
+            # timeout in run()
+            await done
+        except OSError as e:
+            self.logger.error(f"Client {client_id}: Error draining stream: {e}")
+        finally:
+            loop.remove_reader(fd)
+            drain_sock.close()
+            metrics.total_bytes += counts[0]
+            metrics.packet_count += counts[1]
+            metrics.last_packet_time_ns = time.monotonic_ns()
+            # The parser never saw the drained bytes; the connection is
+            # unusable for keep-alive
+            response.close()
 
     async def client_session(self, client_id: int):
         """Simulate a single client session."""
-        self.client_metrics[client_id] = StreamMetrics(start_time=time.time())
+        self.client_metrics[client_id].start_time_ns = time.monotonic_ns()
         
         try:
-            timeout = aiohttp.ClientTimeout(total=None, connect=10)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                self.logger.info(f"Client {client_id}: Connecting to {self.url}")
-                
-                headers = {
-                    'User-Agent': 'FLVLoadTester/1.0',
-                    'Connection': 'keep-alive',
-                    'Accept': '*/*'
-                }
-                
-                async with session.get(self.url, headers=headers) as response:
-                    self.logger.info(f"Client {client_id}: Connected with status {response.status}")
-                    self.logger.debug(f"Client {client_id}: Response headers: {response.headers}")
-                    
-                    if response.status != 200:
-                        self.logger.error(f"Client {client_id}: HTTP {response.status}")
-                        return
+            self.logger.info("Client %s: Connecting to %s", client_id, self.url)
+
+            # Gate connection establishment so thousands of clients don't
+            # race the handshake at once; streaming itself is not limited
+            async with self.sem:
+                response = await self.session.get(self.url, headers=_HEADERS)
 
-                    # Initialize stream reading
-                    content_type = response.headers.get('Content-Type', '')
-                    self.logger.info(f"Client {client_id}: Content-Type: {content_type}")
+            async with response:
+                self.logger.info("Client %s: Connected with status %s", client_id, response.status)
+                self.logger.debug("Client %s: Response headers: %s", client_id, response.headers)
 
-                    # Read stream data without trying to parse header
-                    while self.running:
-                        try:
-                            chunk = await response.content.read(8192)
-                            if not chunk:
-                                self.logger.warning(f"Client {client_id}: End of stream reached")
+                if response.status != 200:
+                    self.logger.error(f"Client {client_id}: HTTP {response.status}")
+                    return
+
+                # Initialize stream reading
+                content_type = response.headers.get('Content-Type', '')
+                self.logger.info("Client %s: Content-Type: %s", client_id, content_type)
+
+                if self.mode == 'drain':
+                    await self._drain_raw_socket(response, client_id)
+                    return
+
+                # Read stream data without trying to parse header.
+                # Bookkeeping is amortized over a batch of chunks so the
+                # hot loop does nothing but read and add to local ints.
+                batch_bytes = 0
+                batch_chunks = 0
+                batch_deadline_ns = time.monotonic_ns() + BATCH_INTERVAL_NS
+                header_checked = False
+                counters_only = self.mode == 'counters'
+                try:
+                    # iter_any() hands over whatever the socket delivered in
+                    # one shot instead of re-chunking it into 8 KiB reads
+                    async for chunk in response.content.iter_any():
+                        # Verify the FLV header once on the first chunk
+                        if not header_checked:
+                            header_checked = True
+                            if not await self.parse_flv_header(chunk[:9]):
+                                self.logger.error(f"Client {client_id}: Not a valid FLV stream")
                                 break
-                            
-                            await self.process_flv_packets(chunk, client_id)
-                            
-                        except asyncio.CancelledError:
-                            self.logger.info(f"Client {client_id}: Session cancelled")
-                            break
-                        except Exception as e:
-                            self.logger.error(f"Client {client_id}: Error reading stream: {e}")
-                            break
+
+                        batch_bytes += len(chunk)
+                        batch_chunks += 1
+                        if counters_only:
+                            # Counters mode: nothing but the two local adds
+                            # above per chunk; totals land at stream end
+                            continue
+                        if batch_chunks >= BATCH_CHUNKS or time.monotonic_ns() >= batch_deadline_ns:
+                            await self.process_flv_packets(batch_bytes, batch_chunks, client_id)
+                            batch_bytes = 0
+                            batch_chunks = 0
+                            batch_deadline_ns = time.monotonic_ns() + BATCH_INTERVAL_NS
+                    else:
+                        self.logger.warning(f"Client {client_id}: End of stream reached")
+
+                except asyncio.CancelledError:
+                    self.logger.info("Client %s: Session cancelled", client_id)
+                except Exception as e:
+                    self.logger.error(f"Client {client_id}: Error reading stream: {e}")
+
+                # Flush whatever is left in the final partial batch
+                if batch_chunks:
+                    if counters_only:
+                        metrics = self.client_metrics[client_id]
+                        metrics.total_bytes += batch_bytes
+                        metrics.packet_count += batch_chunks
+                        metrics.last_packet_time_ns = time.monotonic_ns()
+                    else:
+                        await self.process_flv_packets(batch_bytes, batch_chunks, client_id)
 
         except asyncio.CancelledError:
-            self.logger.info(f"Client {client_id}: Session cancelled")
+            self.logger.info("Client %s: Session cancelled", client_id)
         except Exception as e:
             self.logger.error(f"Client {client_id}: Connection error: {e}")
         finally:
-            self.logger.info(f"Client {client_id}: Session ended")
+            self.logger.info("Client %s: Session ended", client_id)
+
+    @staticmethod
+    def _percentile_ns(reservoir: np.ndarray, count: int, q: float) -> float:
+        """Pick the q-th percentile out of a latency reservoir."""
+        n = min(count, reservoir.shape[0])
+        k = int(q * (n - 1))
+        return float(np.partition(reservoir[:n], k)[k])
 
     def print_statistics(self):
-        """Print test statistics."""
+        """Print test statistics.
+
+        The whole summary is built as one string and emitted as a single
+        log record: per-client logger calls would mean thousands of
+        records (formatting plus handler locking each) for large tests.
+        Per-client sections are only included when verbose is set.
+        """
         total_bytes = 0
         total_packets = 0
-        all_bitrates = []
-        all_latencies = []
-        
-        for client_id, metrics in self.client_metrics.items():
-            duration = metrics.last_packet_time - metrics.start_time if metrics.last_packet_time > 0 else 0
+        total_latency_count = 0
+        total_sum_latency_ns = 0.0
+        total_max_latency_ns = 0.0
+        all_reservoirs = []
+        parts = []
+
+        for client_id, metrics in enumerate(self.client_metrics):
+            duration = (metrics.last_packet_time_ns - metrics.start_time_ns) * 1e-9 if metrics.last_packet_time_ns > 0 else 0
             mbps = (metrics.total_bytes * 8) / (1024 * 1024 * duration) if duration > 0 else 0
-            
-            self.logger.info(f"\nClient {client_id} Statistics:")
-            self.logger.info(f"Total data received: {metrics.total_bytes / (1024*1024):.2f} MB")
-            self.logger.info(f"Average bitrate: {mbps:.2f} Mbps")
-            self.logger.info(f"Packets received: {metrics.packet_count}")
-            self.logger.info(f"Duration: {duration:.2f} seconds")
-            
-            if metrics.latencies:
-                self.logger.info(f"Average latency: {statistics.mean(metrics.latencies)*1000:.2f} ms")
-                self.logger.info(f"Max latency: {max(metrics.latencies)*1000:.2f} ms")
-            
+
+            if self.verbose:
+                parts.append(f"\nClient {client_id} Statistics:")
+                parts.append(f"Total data received: {metrics.total_bytes / (1024*1024):.2f} MB")
+                parts.append(f"Average bitrate: {mbps:.2f} Mbps")
+                parts.append(f"Packets received: {metrics.packet_count}")
+                parts.append(f"Duration: {duration:.2f} seconds")
+
+            if metrics.latency_count:
+                n = metrics.latency_count
+                if self.verbose:
+                    mean_ns = metrics.sum_latency_ns / n
+                    var_ns = max(metrics.sum_latency_sq_ns / n - mean_ns * mean_ns, 0.0)
+                    p99_ns = self._percentile_ns(metrics.latency_reservoir, n, 0.99)
+                    parts.append(f"Average latency: {mean_ns*1e-6:.2f} ms")
+                    parts.append(f"Latency stddev: {var_ns**0.5*1e-6:.2f} ms")
+                    parts.append(f"Max latency: {metrics.max_latency_ns*1e-6:.2f} ms")
+                    parts.append(f"p99 latency: {p99_ns*1e-6:.2f} ms")
+
+                total_latency_count += n
+                total_sum_latency_ns += metrics.sum_latency_ns
+                total_max_latency_ns = max(total_max_latency_ns, metrics.max_latency_ns)
+                all_reservoirs.append(metrics.latency_reservoir[:min(n, RESERVOIR_SIZE)])
+
             total_bytes += metrics.total_bytes
             total_packets += metrics.packet_count
-            all_bitrates.extend(metrics.bitrates)
-            all_latencies.extend(metrics.latencies)
-        
-        self.logger.info("\nOverall Statistics:")
-        self.logger.info(f"Total clients: {self.num_clients}")
-        self.logger.info(f"Total data received: {total_bytes / (1024*1024):.2f} MB")
-        self.logger.info(f"Total packets received: {total_packets}")
-        
-        if all_bitrates:
-            self.logger.info(f"Average bitrate across all clients: {statistics.mean(all_bitrates)/1024/1024:.2f} Mbps")
-        if all_latencies:
-            self.logger.info(f"Average latency across all clients: {statistics.mean(all_latencies)*1000:.2f} ms")
+
+        parts.append("\nOverall Statistics:")
+        parts.append(f"Total clients: {self.num_clients}")
+        parts.append(f"Total data received: {total_bytes / (1024*1024):.2f} MB")
+        parts.append(f"Total packets received: {total_packets}")
+
+        # Aggregate throughput from the totals alone; in counters mode
+        # this is the only bitrate figure available
+        active = [m for m in self.client_metrics if m.last_packet_time_ns > 0]
+        if active:
+            elapsed = (max(m.last_packet_time_ns for m in active)
+                       - min(m.start_time_ns for m in active)) * 1e-9
+            if elapsed > 0:
+                parts.append(f"Aggregate throughput: {total_bytes * 8 / (1024*1024*elapsed):.2f} Mbps")
+
+        if total_latency_count:
+            parts.append(f"Average latency across all clients: {total_sum_latency_ns/total_latency_count*1e-6:.2f} ms")
+            parts.append(f"Max latency across all clients: {total_max_latency_ns*1e-6:.2f} ms")
+            combined = np.concatenate(all_reservoirs)
+            p99_ns = self._percentile_ns(combined, combined.shape[0], 0.99)
+            parts.append(f"p99 latency across all clients: {p99_ns*1e-6:.2f} ms")
+
+        self.logger.info("\n".join(parts))
+
+    def collect_counters(self) -> dict:
+        """Aggregate this tester's metrics into one picklable dict.
+
+        Used by worker processes to ship their results back to the parent
+        for the combined summary.
+        """
+        active = [m for m in self.client_metrics if m.last_packet_time_ns > 0]
+        elapsed = 0.0
+        if active:
+            elapsed = (max(m.last_packet_time_ns for m in active)
+                       - min(m.start_time_ns for m in active)) * 1e-9
+        return {
+            'clients': self.num_clients,
+            'total_bytes': sum(m.total_bytes for m in self.client_metrics),
+            'total_packets': sum(m.packet_count for m in self.client_metrics),
+            'latency_count': sum(m.latency_count for m in self.client_metrics),
+            'sum_latency_ns': math.fsum(m.sum_latency_ns for m in self.client_metrics),
+            'max_latency_ns': max((m.max_latency_ns for m in self.client_metrics), default=0.0),
+            'elapsed': elapsed,
+        }
 
     async def run(self):
         """Run the load test."""
         self.logger.info(f"Starting load test with {self.num_clients} clients for {self.duration} seconds")
-        
+
+        # One shared session: all clients reuse its connection pool, DNS cache
+        # and SSL context instead of paying a fresh handshake per task.
+        # The pool is sized for one long-lived connection per client; the
+        # default limit of 100 would deadlock larger tests. All clients hit
+        # the same host, so the DNS cache collapses num_clients lookups
+        # into one per TTL.
+        timeout = aiohttp.ClientTimeout(total=None, connect=10)
+        connector = aiohttp.TCPConnector(
+            limit=self.num_clients,
+            limit_per_host=self.num_clients,
+            keepalive_timeout=75,
+            use_dns_cache=True,
+            ttl_dns_cache=600,
+            force_close=False,
+            enable_cleanup_closed=True,
+            socket_factory=_make_stream_socket
+        )
+        self.session = aiohttp.ClientSession(timeout=timeout, connector=connector)
+
         try:
-            # Start client sessions
-            tasks = [asyncio.create_task(self.client_session(i)) for i in range(self.num_clients)]
-            
-            # Run for specified duration
-            await asyncio.sleep(self.duration)
-            self.running = False
-            
-            # Wait for all clients to finish
-            await asyncio.gather(*tasks, return_exceptions=True)
-            
+            # The duration timeout cancels the whole group directly, so
+            # the read loops don't need to poll a flag on every chunk
+            async with asyncio.timeout(self.duration):
+                async with asyncio.TaskGroup() as tg:
+                    for i in range(self.num_clients):
+                        tg.create_task(self.client_session(i))
+        except TimeoutError:
+            self.logger.info("Test duration reached")
         except Exception as e:
             self.logger.error(f"Error in main run loop: {e}")
         finally:
+            await self.session.close()
             # Print final statistics
             self.print_statistics()
 
+def _install_uvloop():
+    # uvloop is a drop-in libuv event loop, typically 2-4x faster than the
+    # default selector loop; unavailable on Windows
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
+
+def _run_worker(url, num_clients, duration, max_concurrency, verbose, mode):
+    """Run one worker process: its own event loop with a share of the clients."""
+    _install_uvloop()
+    tester = FLVLoadTester(url, num_clients, duration, max_concurrency,
+                           verbose=verbose, mode=mode)
+    asyncio.run(tester.run())
+    return tester.collect_counters()
+
+
 def main():
     parser = argparse.ArgumentParser(description='HTTP-FLV Load Tester')
     parser.add_argument('url', help='URL of the HTTP-FLV stream')
     parser.add_argument('--clients', type=int, default=10, help='Number of clients to simulate')
     parser.add_argument('--duration', type=int, default=60, help='Test duration in seconds')
+    parser.add_argument('--max-concurrency', type=int, default=200,
+                        help='Maximum number of simultaneous connection attempts')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Include per-client sections in the final statistics')
+    parser.add_argument('--mode', choices=['full', 'counters', 'drain'], default='full',
+                        help='counters skips per-batch latency/bitrate sampling and '
+                             'only counts bytes; drain additionally bypasses the '
+                             'HTTP payload parser and discards data in the kernel')
+    parser.add_argument('--processes', type=int, default=os.cpu_count(),
+                        help='Worker processes to split the clients across; each '
+                             'runs its own event loop')
     args = parser.parse_args()
 
-    tester = FLVLoadTester(args.url, args.clients, args.duration)
-    asyncio.run(tester.run())
+    nproc = max(1, min(args.processes, args.clients))
+    if nproc == 1:
+        _install_uvloop()
+        tester = FLVLoadTester(args.url, args.clients, args.duration, args.max_concurrency,
+                               verbose=args.verbose, mode=args.mode)
+        asyncio.run(tester.run())
+        return
+
+    # Past ~1000 clients a single event loop is CPU-bound on the metric
+    # loop itself; split the clients across one loop per process and sum
+    # the counters at the end
+    shares = [args.clients // nproc + (1 if i < args.clients % nproc else 0)
+              for i in range(nproc)]
+    worker_args = [(args.url, share, args.duration, args.max_concurrency,
+                    args.verbose, args.mode) for share in shares if share > 0]
+
+    ctx = multiprocessing.get_context('spawn')
+    with ctx.Pool(len(worker_args)) as pool:
+        results = pool.starmap(_run_worker, worker_args)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger(__name__)
+
+    total_bytes = sum(r['total_bytes'] for r in results)
+    total_packets = sum(r['total_packets'] for r in results)
+    latency_count = sum(r['latency_count'] for r in results)
+    elapsed = max(r['elapsed'] for r in results)
+    parts = [
+        "\nCombined Statistics:",
+        f"Worker processes: {len(results)}",
+        f"Total clients: {sum(r['clients'] for r in results)}",
+        f"Total data received: {total_bytes / (1024*1024):.2f} MB",
+        f"Total packets received: {total_packets}",
+    ]
+    if elapsed > 0:
+        parts.append(f"Aggregate throughput: {total_bytes * 8 / (1024*1024*elapsed):.2f} Mbps")
+    if latency_count:
+        mean_ns = math.fsum(r['sum_latency_ns'] for r in results) / latency_count
+        max_ns = max(r['max_latency_ns'] for r in results)
+        parts.append(f"Average latency across all clients: {mean_ns*1e-6:.2f} ms")
+        parts.append(f"Max latency across all clients: {max_ns*1e-6:.2f} ms")
+    logger.info("\n".join(parts))
 
 if __name__ == '__main__':
     main()
\ No newline at end of file